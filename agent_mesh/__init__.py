@@ -2,6 +2,14 @@
 
 __version__ = "0.1.0"
 
-from agent_mesh.types import AgentResult, RunConfig, Usage, Artifacts
-
 __all__ = ["AgentResult", "RunConfig", "Usage", "Artifacts", "__version__"]
+
+
+def __getattr__(name: str):
+    # Load the pydantic models on first access so `agent-mesh version` and
+    # `--help` don't pay for importing pydantic.
+    if name in {"AgentResult", "RunConfig", "Usage", "Artifacts"}:
+        from agent_mesh import types
+
+        return getattr(types, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
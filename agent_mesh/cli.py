@@ -30,34 +30,38 @@ def doctor(
 ) -> None:
     """Sanity-check installation/auth and (optionally) run smoke calls."""
     import asyncio
-    import json
-    from pathlib import Path
+
+    import orjson
 
     from agent_mesh.doctor import check_binaries, check_mcp_server_tools, run_smoke
+    from agent_mesh.runners.base import resolve_cwd, run_async
 
     agents = agent or ["claude", "codex", "gemini"]
-    cwd = str(Path(cwd).resolve())
+    cwd = resolve_cwd(cwd)
 
-    bins = check_binaries()
-    selected_bins = {a: bins.get(a) for a in agents if a in bins}
+    async def _run_checks():
+        # Version probes and the MCP handshake are independent; overlap them
+        if not mcp:
+            return await check_binaries(), None
+        return await asyncio.gather(check_binaries(), check_mcp_server_tools(timeout_s=5))
 
-    mcp_result = None
-    if mcp:
-        mcp_result = asyncio.run(check_mcp_server_tools(timeout_s=5))
+    bins, mcp_result = run_async(_run_checks())
+    selected_bins = {a: bins.get(a) for a in agents if a in bins}
 
     smoke_result = None
     if smoke:
-        smoke_result = asyncio.run(run_smoke(agents=agents, cwd=cwd, timeout_s=timeout))
+        smoke_result = run_async(run_smoke(agents=agents, cwd=cwd, timeout_s=timeout))
 
+    # orjson serializes the BinaryCheck/McpCheck dataclasses natively
     payload = {
         "cwd": cwd,
-        "binaries": {k: (v.__dict__ if v else None) for k, v in selected_bins.items()},
-        "mcp": (mcp_result.__dict__ if mcp_result else None),
+        "binaries": selected_bins,
+        "mcp": mcp_result,
         "smoke": smoke_result,
     }
 
     if json_out:
-        typer.echo(json.dumps(payload, indent=2))
+        typer.echo(orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode())
     else:
         typer.echo(f"cwd: {cwd}")
         if mcp_result:
@@ -131,12 +135,10 @@ def run(
     timeout: Annotated[int, typer.Option("--timeout", "-t", help="Timeout in seconds")] = 120,
 ) -> None:
     """Run a single agent in headless mode."""
-    import asyncio
-    import json
-
     from agent_mesh.runners import run_agent
+    from agent_mesh.runners.base import run_async
 
-    result = asyncio.run(run_agent(agent, prompt, cwd, timeout))
+    result = run_async(run_agent(agent, prompt, cwd, timeout))
     typer.echo(result.model_dump_json(indent=2))
 
 
@@ -148,11 +150,10 @@ def pipeline(
 ) -> None:
     """Run a pipeline (e.g., review: Claude implements → Codex reviews)."""
     if name == "review":
-        import asyncio
-
         from agent_mesh.pipelines.review import run_review_pipeline
+        from agent_mesh.runners.base import run_async
 
-        result = asyncio.run(run_review_pipeline(prompt, cwd))
+        result = run_async(run_review_pipeline(prompt, cwd))
         typer.echo(result)
     else:
         typer.echo(f"Unknown pipeline: {name}", err=True)
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
 import os
 import shutil
-import subprocess
 import sys
 from dataclasses import dataclass, field, replace
 from pathlib import Path
 
+import orjson
+
 from agent_mesh.runners import run_agent
 from agent_mesh.types import AgentResult
 
@@ -31,25 +32,62 @@ class McpCheck:
     error: str | None = None
 
 
-def _run_version(cmd: str) -> str | None:
+async def _run_version(cmd: str) -> str | None:
     try:
-        proc = subprocess.run(
-            [cmd, "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5,
+        proc = await asyncio.create_subprocess_exec(
+            cmd,
+            "--version",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
     except Exception:
         return None
-    out = (proc.stdout or proc.stderr).strip()
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    out = (stdout or stderr).decode("utf-8", errors="replace").strip()
     return out.splitlines()[0].strip() if out else None
 
 
-def check_binaries() -> dict[str, BinaryCheck]:
+@functools.lru_cache(maxsize=16)
+def _which(name: str, search_path: str) -> str | None:
+    return shutil.which(name, path=search_path)
+
+
+# (resolved path, mtime_ns) -> first line of `--version`; mtime_ns is part
+# of the key so an upgraded binary is re-probed
+_version_cache: dict[tuple[str, int], str | None] = {}
+
+
+async def _cached_version(path: str) -> str | None:
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+
+    key = (path, mtime_ns)
+    if key not in _version_cache:
+        _version_cache[key] = await _run_version(path)
+    return _version_cache[key]
+
+
+async def check_binaries() -> dict[str, BinaryCheck]:
     checks: dict[str, BinaryCheck] = {}
+    search_path = os.environ.get("PATH", os.defpath)
+    names = ["claude", "codex", "gemini"]
+
+    paths = {name: _which(name, search_path) for name in names}
+    found = [name for name in names if paths[name]]
+
+    # Version probes are independent subprocesses; run them concurrently
+    versions = await asyncio.gather(*(_cached_version(paths[name]) for name in found))
+    found_versions = dict(zip(found, versions))
 
-    for name in ["claude", "codex", "gemini"]:
-        path = shutil.which(name)
+    for name in names:
+        path = paths[name]
         if not path:
             checks[name] = BinaryCheck(name=name, ok=False, warning="not found on PATH")
             continue
@@ -58,7 +96,7 @@ def check_binaries() -> dict[str, BinaryCheck]:
             name=name,
             ok=True,
             path=path,
-            version=_run_version(name),
+            version=found_versions[name],
         )
 
     # Add lightweight env warnings (not hard failures)
@@ -78,6 +116,22 @@ def check_binaries() -> dict[str, BinaryCheck]:
     return checks
 
 
+# The doctor handshake is static, so frame the JSON-RPC requests once
+_MCP_INIT_MSG = orjson.dumps(
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "agent-mesh-doctor", "version": "0"},
+        },
+    }
+) + b"\n"
+_MCP_TOOLS_LIST_MSG = b'{"jsonrpc":"2.0","id":2,"method":"tools/list"}\n'
+
+
 async def check_mcp_server_tools(timeout_s: int = 5) -> McpCheck:
     """Start the MCP server and validate it responds to initialize + tools/list."""
     proc = await asyncio.create_subprocess_exec(
@@ -90,35 +144,32 @@ async def check_mcp_server_tools(timeout_s: int = 5) -> McpCheck:
         cwd=str(Path.cwd()),
     )
 
-    async def _send(msg: dict) -> None:
+    async def _send(*frames: bytes) -> None:
+        # Queue all frames, then drain once
         assert proc.stdin is not None
-        proc.stdin.write((json.dumps(msg) + "\n").encode())
+        proc.stdin.writelines(frames)
         await proc.stdin.drain()
 
     async def _recv() -> dict:
         assert proc.stdout is not None
         line = await asyncio.wait_for(proc.stdout.readline(), timeout=timeout_s)
-        return json.loads(line)
+        return orjson.loads(line)
 
     try:
-        await _send(
-            {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {"name": "agent-mesh-doctor", "version": "0"},
-                },
-            }
-        )
-        init_resp = await _recv()
+        # Pipeline both requests instead of waiting for the initialize
+        # response first, then match responses by id
+        await _send(_MCP_INIT_MSG, _MCP_TOOLS_LIST_MSG)
+        responses: dict[int, dict] = {}
+        while len(responses) < 2:
+            msg = await _recv()
+            if msg.get("id") in (1, 2):
+                responses[msg["id"]] = msg
+
+        init_resp = responses[1]
         if "result" not in init_resp:
             return McpCheck(ok=False, tools=[], error=f"initialize failed: {init_resp}")
 
-        await _send({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
-        tools_resp = await _recv()
+        tools_resp = responses[2]
         if "result" not in tools_resp:
             return McpCheck(ok=False, tools=[], error=f"tools/list failed: {tools_resp}")
 
@@ -142,25 +193,23 @@ async def check_mcp_server_tools(timeout_s: int = 5) -> McpCheck:
             proc.kill()
 
 
+# Keys checked (in order) for a plain-text response, per agent
+_RESPONSE_KEYS: dict[str, tuple[str, ...]] = {
+    "codex": ("response",),
+    "claude": ("result", "output", "response", "text"),
+    "gemini": ("response", "text"),
+}
+
+
 def _extract_response_text(result: AgentResult) -> str | None:
     s = result.structured or {}
 
-    if result.agent == "codex":
-        resp = s.get("response")
-        return resp.strip() if isinstance(resp, str) else None
-
-    if result.agent == "claude":
-        for key in ["result", "output", "response", "text"]:
-            v = s.get(key)
-            if isinstance(v, str) and v.strip():
-                return v.strip()
-        return None
+    for key in _RESPONSE_KEYS.get(result.agent, ()):
+        v = s.get(key)
+        if isinstance(v, str) and (text := v.strip()):
+            return text
 
     if result.agent == "gemini":
-        for key in ["response", "text"]:
-            v = s.get(key)
-            if isinstance(v, str) and v.strip():
-                return v.strip()
         # Best-effort for common nested shapes
         try:
             candidates = s.get("candidates")
@@ -173,7 +222,6 @@ def _extract_response_text(result: AgentResult) -> str | None:
                         return text.strip()
         except Exception:
             pass
-        return None
 
     return None
 
@@ -187,8 +235,23 @@ async def run_smoke(
     prompt = "What is 2+2? Reply with just: 4"
     results: dict[str, dict] = {}
 
-    for agent in agents:
-        r = await run_agent(agent=agent, prompt=prompt, cwd=cwd, timeout_s=timeout_s)
+    # Agents are independent subprocesses, so run them concurrently:
+    # wall time is the slowest agent rather than the sum.
+    outcomes = await asyncio.gather(
+        *(run_agent(agent=agent, prompt=prompt, cwd=cwd, timeout_s=timeout_s) for agent in agents),
+        return_exceptions=True,
+    )
+
+    for agent, r in zip(agents, outcomes):
+        if isinstance(r, BaseException):
+            results[agent] = {
+                "ok": False,
+                "exit_code": 1,
+                "duration_ms": 0,
+                "response": None,
+                "stderr": f"{type(r).__name__}: {r}"[:200],
+            }
+            continue
         results[agent] = {
             "ok": r.ok,
             "exit_code": r.exit_code,
@@ -1,11 +1,17 @@
 """MCP server exposing agent-mesh tools for stdio transport."""
 
-import asyncio
 import sys
-from typing import Annotated, Literal
+from typing import Annotated
 
+import orjson
 from mcp.server.fastmcp import FastMCP
 
+from agent_mesh.runners.base import kill_live_subprocesses, run_async
+from agent_mesh.runners.claude import run_claude
+from agent_mesh.runners.codex import run_codex
+from agent_mesh.runners.gemini import run_gemini
+from agent_mesh.types import AgentResult
+
 # Create MCP server
 mcp = FastMCP(
     name="agent-mesh",
@@ -13,46 +19,52 @@ mcp = FastMCP(
 )
 
 
+def _dump_result(result: AgentResult) -> str:
+    """Serialize an AgentResult for a tool response.
+
+    orjson over model_dump is much faster than model_dump_json on large
+    stdout/stderr strings; no indent since MCP clients don't need it.
+    """
+    return orjson.dumps(result.model_dump(mode="json")).decode()
+
+
 @mcp.tool()
 async def claude_run(
     prompt: Annotated[str, "The task or prompt. Include project context (audience, principles like YAGNI, what NOT to do) to avoid enterprise-pattern defaults"],
     cwd: Annotated[str, "Working directory"] = ".",
     model: Annotated[str | None, "Model ID (e.g., us.anthropic.claude-sonnet-4-5-20250929-v1:0)"] = None,
+    timeout_s: Annotated[int, "Timeout in seconds (default 1800=30min for full agentic workflow)"] = 1800,
 ) -> str:
     """Run Claude Code CLI in headless mode. Full agentic workflow with tool use. Default 30min timeout. Uses Bedrock if CLAUDE_CODE_USE_BEDROCK=1."""
-    from agent_mesh.runners.claude import run_claude
-
-    result = await run_claude(prompt, cwd, 1800, auto_approve=True, model=model)
-    return result.model_dump_json(indent=2)
+    result = await run_claude(prompt, cwd, timeout_s, auto_approve=True, model=model)
+    return _dump_result(result)
 
 
 @mcp.tool()
-async def codex_run(
+async def codex_exec(
     task: Annotated[str, "The task. Include project context (audience, principles like YAGNI, what NOT to do) to avoid enterprise-pattern defaults"],
     cwd: Annotated[str, "Working directory"] = ".",
     reasoning_effort: Annotated[str, "Reasoning effort: low, medium, high"] = "low",
+    timeout_s: Annotated[int, "Timeout in seconds (default 1800=30min for full agentic workflow)"] = 1800,
 ) -> str:
     """Run Codex CLI (gpt-5.2) in headless mode. Full agentic workflow with tool use. Default 30min timeout. Use higher reasoning_effort for complex tasks."""
-    from agent_mesh.runners.codex import run_codex
-
     result = await run_codex(
-        task, cwd, 1800,
+        task, cwd, timeout_s,
         json_events=True,
         reasoning_effort=reasoning_effort,  # type: ignore
     )
-    return result.model_dump_json(indent=2)
+    return _dump_result(result)
 
 
 @mcp.tool()
 async def gemini_run(
     prompt: Annotated[str, "The task or prompt. Include project context (audience, principles like YAGNI, what NOT to do) to avoid enterprise-pattern defaults"],
     cwd: Annotated[str, "Working directory"] = ".",
+    timeout_s: Annotated[int, "Timeout in seconds (default 1800=30min for full agentic workflow)"] = 1800,
 ) -> str:
     """Run Gemini CLI in headless mode. Full agentic workflow with tool use. Default 30min timeout. Requires GEMINI_API_KEY."""
-    from agent_mesh.runners.gemini import run_gemini
-
-    result = await run_gemini(prompt, cwd, 1800)
-    return result.model_dump_json(indent=2)
+    result = await run_gemini(prompt, cwd, timeout_s)
+    return _dump_result(result)
 
 
 def main():
@@ -66,7 +78,10 @@ def main():
         stream=sys.stderr,
     )
 
-    asyncio.run(mcp.run_stdio_async())
+    try:
+        run_async(mcp.run_stdio_async())
+    finally:
+        kill_live_subprocesses()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,184 @@
 """Base runner utilities and dispatcher."""
 
 import asyncio
-from datetime import datetime, timezone
-from pathlib import Path
+import contextlib
+import logging
+import os
+import signal
+import tempfile
+import time
+import weakref
+from collections.abc import Awaitable, Callable, Coroutine
+from datetime import datetime, timedelta, timezone
+from typing import Any, TypeVar
 
-from agent_mesh.types import AgentResult, Artifacts, Usage
+from agent_mesh.types import AgentResult
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Per-stream capture caps. A long agent run can stream many MB of JSONL;
+# only the tail is kept since that's where final results live.
+MAX_STDOUT_BYTES = 32 * 1024 * 1024
+MAX_STDERR_BYTES = 1024 * 1024
+_READ_CHUNK = 64 * 1024
+# Captured output beyond this much is spooled to a temp file instead of RAM
+_SPOOL_MAX_MEMORY = 256 * 1024
+# How long to keep draining pipes after killing a timed-out child
+_DRAIN_TIMEOUT_S = 2
+# Grace period between SIGTERM and SIGKILL for a timed-out agent
+_TERM_GRACE_S = 2
+
+
+class _TailBuffer:
+    """Bounded output buffer that keeps the last `limit` bytes written.
+
+    Output goes through a SpooledTemporaryFile: small outputs never leave
+    memory, large ones spill to disk rather than growing the heap. Once the
+    spool reaches twice the limit its tail is copied into a fresh spool, so
+    disk use stays bounded as well.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.dropped = 0
+        self._spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY)
+
+    def write(self, chunk: bytes) -> None:
+        self._spool.write(chunk)
+        if self._spool.tell() >= 2 * self.limit:
+            self._compact()
+
+    def _compact(self) -> None:
+        size = self._spool.tell()
+        self._spool.seek(size - self.limit)
+        tail = self._spool.read()
+        self._spool.close()
+        self._spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY)
+        self._spool.write(tail)
+        self.dropped += size - self.limit
+
+    def getvalue(self) -> str:
+        """Decode the captured tail. Closes the spool; call once.
+
+        Afterwards `dropped` is the total number of bytes cut from the head.
+        """
+        size = self._spool.tell()
+        start = max(0, size - self.limit)
+        self._spool.seek(start)
+        data = self._spool.read()
+        self._spool.close()
+
+        text = data.decode("utf-8", errors="replace")
+        self.dropped += start
+        if self.dropped:
+            text = f"[... {self.dropped} bytes dropped from start of output ...]\n" + text
+        return text
+
+
+def _salvage(buf: _TailBuffer) -> str:
+    """Whatever a buffer still holds after a failed read, or "" if that fails too."""
+    try:
+        return buf.getvalue()
+    except (OSError, ValueError):
+        return ""
+
+
+def truncate_output(text: str, limit: int = 2000) -> str:
+    """Cap text at limit chars, noting how much was cut.
+
+    Returns text itself when it already fits, so the common short-output
+    case doesn't copy it.
+    """
+    if len(text) <= limit:
+        return text
+    return text[:limit] + f"\n... [truncated {len(text) - limit} chars]"
+
+
+def run_async(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion like asyncio.run(), on uvloop if installed.
+
+    The workload is almost entirely subprocess pipe I/O, where uvloop's
+    libuv transports are noticeably faster than the default loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        loop_factory = None
+    else:
+        loop_factory = uvloop.new_event_loop
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(main)
+
+
+# Agent subprocesses that are still running, so shutdown can reap any that
+# escaped per-call cleanup
+_live_procs: "weakref.WeakSet[asyncio.subprocess.Process]" = weakref.WeakSet()
+
+
+def _kill(proc: asyncio.subprocess.Process, sig: int | None = None) -> None:
+    """Signal the child's whole process group (SIGKILL by default).
+
+    Agents are started in their own session, so this also reaches the node
+    workers and MCP servers they fork, which would otherwise be orphaned.
+    """
+    # The group may have exited on its own between our check and the signal
+    with contextlib.suppress(ProcessLookupError):
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, sig or signal.SIGKILL)
+        else:
+            proc.kill()
+
+
+def kill_live_subprocesses() -> None:
+    """Kill any agent subprocesses still running. Best-effort, for shutdown."""
+    for proc in list(_live_procs):
+        if proc.returncode is None:
+            _kill(proc)
+
+
+# One semaphore per event loop (a semaphore can't be shared across loops),
+# capping how many agents run at once. Agents mostly wait on the network, so
+# the default allows more of them than there are cores, but each is still a
+# heavyweight node process and an unbounded fan-out thrashes.
+_run_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _max_parallel() -> int:
+    default = max(8, os.cpu_count() or 1)
+    raw = os.environ.get("AGENT_MESH_MAX_PARALLEL")
+    if raw is None:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("ignoring invalid AGENT_MESH_MAX_PARALLEL=%r; using %d", raw, default)
+        return default
+
+
+def _get_run_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _run_slots.get(loop)
+    if slots is None:
+        slots = _run_slots[loop] = asyncio.Semaphore(_max_parallel())
+    return slots
+
+
+def resolve_cwd(cwd: str) -> str:
+    """Return cwd as an absolute path string.
+
+    Uses lexical os.path.abspath rather than Path.resolve(): subprocesses
+    only need an absolute cwd, not symlink-normalized, so there is no
+    reason to stat every path component. Absolute paths without `..`
+    segments (what MCP hosts send) are returned untouched.
+    """
+    if os.path.isabs(cwd) and "/.." not in cwd:
+        return cwd
+    return os.path.abspath(cwd)
 
 
 async def run_subprocess(
@@ -12,19 +186,61 @@ async def run_subprocess(
     cwd: str,
     timeout_s: int,
     env: dict[str, str] | None = None,
-) -> tuple[int, str, str, datetime, datetime]:
+    max_stdout_bytes: int | None = None,
+) -> tuple[int, str, str, datetime, datetime, int, int]:
     """Run a subprocess with timeout and capture output.
 
     Always returns a tuple, even on errors (FileNotFoundError, permission errors, etc).
     On timeout, returns partial output captured so far rather than losing everything.
+    At most max_stdout_bytes (default MAX_STDOUT_BYTES) of stdout are kept, from
+    the end; the pipe is still drained so the child never blocks on it.
+
+    At most AGENT_MESH_MAX_PARALLEL (default: the CPU count, but at least 8)
+    subprocesses run at once per event loop; further calls wait for a slot
+    before starting. That wait counts against timeout_s.
+
+    Returns (exit_code, stdout, stderr, started_at, ended_at, duration_ms,
+    stdout_dropped). duration_ms comes from the monotonic clock, so it is
+    immune to wall-clock jumps. Time spent waiting for a slot is not included.
+    stdout_dropped is how many bytes were cut from the head of stdout to stay
+    within the cap (0 when stdout is complete).
     """
-    import os
+    slots = _get_run_slots()
+    queued_at = time.monotonic()
+    try:
+        async with asyncio.timeout(timeout_s):
+            await slots.acquire()
+    except TimeoutError:
+        now = datetime.now(timezone.utc)
+        stderr = f"[TIMEOUT after {timeout_s}s waiting for a free agent slot (AGENT_MESH_MAX_PARALLEL)]"
+        return -1, "", stderr, now, now, 0, 0
+    try:
+        remaining_s = timeout_s - (time.monotonic() - queued_at)
+        return await _run_subprocess(cmd, cwd, timeout_s, remaining_s, env, max_stdout_bytes)
+    finally:
+        slots.release()
+
 
-    full_env = os.environ.copy()
-    if env:
-        full_env.update(env)
+async def _run_subprocess(
+    cmd: list[str],
+    cwd: str,
+    timeout_s: int,
+    remaining_s: float,
+    env: dict[str, str] | None,
+    max_stdout_bytes: int | None,
+) -> tuple[int, str, str, datetime, datetime, int, int]:
+    # Drop overrides that match what the child would inherit anyway; when
+    # nothing is left, env=None lets it inherit without copying os.environ
+    overrides = {k: v for k, v in env.items() if os.environ.get(k) != v} if env else None
+    full_env = {**os.environ, **overrides} if overrides else None
 
     started_at = datetime.now(timezone.utc)
+    t0 = time.monotonic_ns()
+
+    def finish() -> tuple[datetime, int]:
+        # Derive ended_at from the monotonic delta instead of a second datetime.now()
+        elapsed_ns = time.monotonic_ns() - t0
+        return started_at + timedelta(microseconds=elapsed_ns // 1000), elapsed_ns // 1_000_000
 
     try:
         proc = await asyncio.create_subprocess_exec(
@@ -34,88 +250,147 @@ async def run_subprocess(
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             env=full_env,
+            start_new_session=True,  # Own process group, so timeouts reach grandchildren
         )
     except FileNotFoundError as e:
-        ended_at = datetime.now(timezone.utc)
-        return 127, "", f"Command not found: {cmd[0]} ({e})", started_at, ended_at
+        ended_at, duration_ms = finish()
+        return 127, "", f"Command not found: {cmd[0]} ({e})", started_at, ended_at, duration_ms, 0
     except PermissionError as e:
-        ended_at = datetime.now(timezone.utc)
-        return 126, "", f"Permission denied: {e}", started_at, ended_at
+        ended_at, duration_ms = finish()
+        return 126, "", f"Permission denied: {e}", started_at, ended_at, duration_ms, 0
     except NotADirectoryError as e:
-        ended_at = datetime.now(timezone.utc)
-        return 1, "", f"Invalid working directory: {cwd} ({e})", started_at, ended_at
+        ended_at, duration_ms = finish()
+        return 1, "", f"Invalid working directory: {cwd} ({e})", started_at, ended_at, duration_ms, 0
     except Exception as e:
-        ended_at = datetime.now(timezone.utc)
-        return 1, "", f"Failed to start subprocess: {e}", started_at, ended_at
+        ended_at, duration_ms = finish()
+        return 1, "", f"Failed to start subprocess: {e}", started_at, ended_at, duration_ms, 0
 
-    # Stream output into buffers so we can return partial results on timeout
-    stdout_chunks: list[bytes] = []
-    stderr_chunks: list[bytes] = []
+    # Stream output into bounded buffers so we can return partial results on
+    # timeout without memory growing with the length of the run
+    stdout_buf = _TailBuffer(max_stdout_bytes or MAX_STDOUT_BYTES)
+    stderr_buf = _TailBuffer(MAX_STDERR_BYTES)
 
-    async def read_stream(stream: asyncio.StreamReader, chunks: list[bytes]) -> None:
+    async def read_stream(stream: asyncio.StreamReader, buf: _TailBuffer) -> None:
+        # Fixed-size reads rather than readline(): a single JSONL event can
+        # exceed the StreamReader line limit
         while True:
-            chunk = await stream.read(8192)
+            chunk = await stream.read(_READ_CHUNK)
             if not chunk:
                 break
-            chunks.append(chunk)
+            buf.write(chunk)
+
+    _live_procs.add(proc)
 
+    timed_out = False
+    reader_error: str | None = None
     try:
-        await asyncio.wait_for(
-            asyncio.gather(
-                read_stream(proc.stdout, stdout_chunks),
-                read_stream(proc.stderr, stderr_chunks),
-                proc.wait(),
-            ),
-            timeout=timeout_s,
-        )
-    except asyncio.TimeoutError:
-        proc.kill()
-        await proc.wait()
-        ended_at = datetime.now(timezone.utc)
-        stdout = b"".join(stdout_chunks).decode("utf-8", errors="replace")
-        stderr = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+        # One task group owns the readers and the wait: if the caller cancels
+        # or a reader fails, the siblings are cancelled and awaited with it
+        async with asyncio.TaskGroup() as tg:
+            readers = [
+                tg.create_task(read_stream(proc.stdout, stdout_buf)),
+                tg.create_task(read_stream(proc.stderr, stderr_buf)),
+            ]
+            waiter = tg.create_task(proc.wait())
+
+            # asyncio.wait() doesn't cancel on timeout, so after killing the
+            # child the readers can still collect what it wrote before dying
+            _, pending = await asyncio.wait([*readers, waiter], timeout=remaining_s)
+            if pending:
+                timed_out = True
+                # Ask politely first so agents can clean up, then SIGKILL the
+                # group; the second signal also catches descendants that
+                # ignored SIGTERM
+                _kill(proc, signal.SIGTERM)
+                await asyncio.wait([waiter], timeout=_TERM_GRACE_S)
+                _kill(proc)
+                await waiter
+                _, pending = await asyncio.wait(readers, timeout=_DRAIN_TIMEOUT_S)
+                # A grandchild still holds the pipe open; keep what we have
+                for task in pending:
+                    task.cancel()
+    except* Exception as eg:
+        # A reader failed (e.g. ENOSPC spooling output to disk); report it
+        # like a spawn failure instead of raising an ExceptionGroup
+        reader_error = "; ".join(f"{type(e).__name__}: {e}" for e in eg.exceptions)
+    finally:
+        if proc.returncode is None:
+            # Caller went away (e.g. MCP client cancelled the tool call) or a
+            # reader failed; don't leave the agent running as an orphan
+            _kill(proc)
+            await proc.wait()
+        _live_procs.discard(proc)
+
+    if reader_error is not None:
+        ended_at, duration_ms = finish()
+        stdout = _salvage(stdout_buf)
+        stderr = _salvage(stderr_buf) + f"\n\n[Failed reading subprocess output: {reader_error}]"
+        return 1, stdout, stderr, started_at, ended_at, duration_ms, stdout_buf.dropped
+
+    if timed_out:
+        ended_at, duration_ms = finish()
+        stdout = stdout_buf.getvalue()
+        stderr = stderr_buf.getvalue()
         timeout_msg = f"\n\n[TIMEOUT after {timeout_s}s - partial output above]"
-        return -1, stdout, stderr + timeout_msg, started_at, ended_at
+        return -1, stdout, stderr + timeout_msg, started_at, ended_at, duration_ms, stdout_buf.dropped
 
-    ended_at = datetime.now(timezone.utc)
+    ended_at, duration_ms = finish()
     return (
         proc.returncode or 0,
-        b"".join(stdout_chunks).decode("utf-8", errors="replace"),
-        b"".join(stderr_chunks).decode("utf-8", errors="replace"),
+        stdout_buf.getvalue(),
+        stderr_buf.getvalue(),
         started_at,
         ended_at,
+        duration_ms,
+        stdout_buf.dropped,
     )
 
 
+# Agent name -> runner coroutine function, filled on first dispatch. The
+# runner modules import this one, so they can't be imported at module level.
+_RUNNERS: dict[str, Callable[[str, str, int], Awaitable[AgentResult]]] = {}
+
+
+def _get_runner(agent: str) -> Callable[[str, str, int], Awaitable[AgentResult]] | None:
+    runner = _RUNNERS.get(agent)
+    if runner is not None:
+        return runner
+
+    if agent == "claude":
+        from agent_mesh.runners.claude import run_claude as runner
+    elif agent == "codex":
+        from agent_mesh.runners.codex import run_codex as runner
+    elif agent == "gemini":
+        from agent_mesh.runners.gemini import run_gemini as runner
+    else:
+        return None
+
+    _RUNNERS[agent] = runner
+    return runner
+
+
 async def run_agent(agent: str, prompt: str, cwd: str = ".", timeout_s: int = 1800) -> AgentResult:
     """Dispatch to the appropriate agent runner.
 
     Note: These run full agentic workflows (not single LLM calls).
     Default 30min timeout accounts for tool use, retries, and I/O.
     """
-    # Resolve cwd to absolute path
-    cwd = str(Path(cwd).resolve())
+    cwd = resolve_cwd(cwd)
 
-    if agent == "claude":
-        from agent_mesh.runners.claude import run_claude
-        return await run_claude(prompt, cwd, timeout_s)
-    elif agent == "codex":
-        from agent_mesh.runners.codex import run_codex
-        return await run_codex(prompt, cwd, timeout_s)
-    elif agent == "gemini":
-        from agent_mesh.runners.gemini import run_gemini
-        return await run_gemini(prompt, cwd, timeout_s)
-    else:
-        # Return error result for unknown agent
-        now = datetime.now(timezone.utc)
-        return AgentResult(
-            agent="unknown",
-            cwd=cwd,
-            ok=False,
-            exit_code=1,
-            started_at=now,
-            ended_at=now,
-            duration_ms=0,
-            stdout="",
-            stderr=f"Unknown agent: {agent}. Must be claude, codex, or gemini.",
-        )
+    runner = _get_runner(agent)
+    if runner is not None:
+        return await runner(prompt, cwd, timeout_s)
+
+    # Return error result for unknown agent
+    now = datetime.now(timezone.utc)
+    return AgentResult(
+        agent="unknown",
+        cwd=cwd,
+        ok=False,
+        exit_code=1,
+        started_at=now,
+        ended_at=now,
+        duration_ms=0,
+        stdout="",
+        stderr=f"Unknown agent: {agent}. Must be claude, codex, or gemini.",
+    )
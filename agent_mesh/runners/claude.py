@@ -1,11 +1,15 @@
 """Claude Code CLI runner."""
 
-import json
 import os
-from datetime import timezone
 
-from agent_mesh.runners.base import run_subprocess
-from agent_mesh.types import AgentResult, Artifacts, Usage
+import orjson
+
+from agent_mesh.runners.base import run_subprocess, truncate_output
+from agent_mesh.types import AgentResult, Usage
+
+# Fixed argv pieces; the prompt goes between them
+_BASE_CMD = ("claude", "-p")
+_OUTPUT_OPTS = ("--output-format", "json")
 
 
 async def run_claude(
@@ -40,13 +44,7 @@ async def run_claude(
         AWS_PROFILE: AWS profile for Bedrock auth
         AWS_REGION: AWS region for Bedrock
     """
-    cmd = [
-        "claude",
-        "-p",
-        prompt,
-        "--output-format",
-        "json",
-    ]
+    cmd = [*_BASE_CMD, prompt, *_OUTPUT_OPTS]
 
     if auto_approve:
         cmd.append("--dangerously-skip-permissions")
@@ -64,25 +62,19 @@ async def run_claude(
     if model:
         env["ANTHROPIC_MODEL"] = model
 
-    # Pass through other relevant env vars
-    for key in ["ANTHROPIC_MODEL", "ANTHROPIC_DEFAULT_HAIKU_MODEL", "ANTHROPIC_DEFAULT_SONNET_MODEL"]:
-        if key in os.environ and key not in env:
-            env[key] = os.environ[key]
-
-    exit_code, stdout, stderr, started_at, ended_at = await run_subprocess(
+    exit_code, stdout, stderr, started_at, ended_at, duration_ms, _ = await run_subprocess(
         cmd, cwd, timeout_s, env=env if env else None
     )
 
-    duration_ms = int((ended_at - started_at).total_seconds() * 1000)
-
     # Parse structured output if possible
     structured: dict = {}
     usage = Usage()
     is_error = False
 
-    if stdout.strip():
+    # isspace() answers the same question as strip() without copying stdout
+    if stdout and not stdout.isspace():
         try:
-            data = json.loads(stdout)
+            data = orjson.loads(stdout)
             # Only keep the essential fields, not full conversation/tool history
             if "result" in data:
                 structured["result"] = data["result"]
@@ -97,21 +89,15 @@ async def run_claude(
                     cached_input_tokens=data["usage"].get("cache_read_input_tokens"),
                 )
                 structured["usage"] = data["usage"]
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Truncate raw output if it's huge
-            max_raw = 2000
-            raw = stdout[:max_raw]
-            if len(stdout) > max_raw:
-                raw += f"\n... [truncated {len(stdout) - max_raw} chars]"
-            structured = {"raw_output": raw}
+            structured = {"raw_output": truncate_output(stdout)}
 
     # Truncate stdout to avoid context blowup
-    max_stdout = 2000
-    truncated_stdout = stdout[:max_stdout]
-    if len(stdout) > max_stdout:
-        truncated_stdout += f"\n... [truncated {len(stdout) - max_stdout} chars]"
+    truncated_stdout = truncate_output(stdout)
 
-    return AgentResult(
+    # Every field is already the right type here, so skip validation
+    return AgentResult.model_construct(
         agent="claude",
         cwd=cwd,
         ok=exit_code == 0 and not is_error,
@@ -1,14 +1,49 @@
 """Codex CLI runner."""
 
-import json
-import os
 from typing import Literal
 
-from agent_mesh.runners.base import run_subprocess
-from agent_mesh.types import AgentResult, Usage
+import orjson
+
+from agent_mesh.runners.base import run_subprocess, truncate_output
+from agent_mesh.types import AgentResult
 
 ReasoningEffort = Literal["none", "low", "medium", "high", "xhigh"]
 
+# Only the tail of the JSONL event stream is needed (final agent_message),
+# so keep far less than the default capture
+_MAX_CAPTURE_BYTES = 4 * 1024 * 1024
+
+# Fixed argv pieces; per-call options are spliced in between
+_BASE_CMD = ("codex",)
+_WEB_SEARCH_OPTS = ("--enable", "web_search_request")
+_EXEC_OPTS = ("exec", "--dangerously-bypass-approvals-and-sandbox", "--skip-git-repo-check")
+
+
+def _last_agent_message(stdout: str) -> str | None:
+    """Return the text of the last agent_message event in a JSONL stream.
+
+    Scans lines from the end: the final answer is almost always in the
+    last few events, so a long run doesn't require parsing every line.
+    Codex emits: {"type":"item.completed","item":{"type":"agent_message","text":"..."}}
+    """
+    loads = orjson.loads  # bound once for the per-line loop
+    end = len(stdout)
+    while end > 0:
+        start = stdout.rfind("\n", 0, end) + 1
+        line = stdout[start:end]
+        end = start - 1
+        if not line or line.isspace():
+            continue
+        try:
+            event = loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        if event.get("type") == "item.completed":
+            item = event.get("item", {})
+            if item.get("type") == "agent_message" and "text" in item:
+                return item["text"]
+    return None
+
 
 async def run_codex(
     task: str,
@@ -37,65 +72,41 @@ async def run_codex(
         OPENAI_API_KEY: Required for Codex API access
     """
     # Base codex command with global options
-    cmd = [
-        "codex",
-        "-m", model,
-        "-c", f"model_reasoning_effort={reasoning_effort}",
-    ]
+    cmd = [*_BASE_CMD, "-m", model, "-c", f"model_reasoning_effort={reasoning_effort}"]
 
     if web_search:
-        cmd.extend(["--enable", "web_search_request"])
+        cmd.extend(_WEB_SEARCH_OPTS)
 
     # exec subcommand with its specific options
-    cmd.append("exec")
-    cmd.extend([
-        "--dangerously-bypass-approvals-and-sandbox",
-        "--skip-git-repo-check",
-    ])
+    cmd.extend(_EXEC_OPTS)
 
     if json_events:
         cmd.append("--json")
 
     cmd.append(task)
 
-    exit_code, stdout, stderr, started_at, ended_at = await run_subprocess(
-        cmd, cwd, timeout_s
+    exit_code, stdout, stderr, started_at, ended_at, duration_ms, stdout_dropped = await run_subprocess(
+        cmd, cwd, timeout_s, max_stdout_bytes=_MAX_CAPTURE_BYTES
     )
 
-    duration_ms = int((ended_at - started_at).total_seconds() * 1000)
-
     # Parse JSONL events if json mode
     structured: dict = {}
-    response_text: str | None = None
-    event_count = 0
-
-    if json_events and stdout.strip():
-        for line in stdout.strip().split("\n"):
-            if line.strip():
-                try:
-                    event = json.loads(line)
-                    event_count += 1
-                    # Extract final agent message
-                    # Codex emits: {"type":"item.completed","item":{"type":"agent_message","text":"..."}}
-                    if event.get("type") == "item.completed":
-                        item = event.get("item", {})
-                        if item.get("type") == "agent_message" and "text" in item:
-                            response_text = item["text"]
-                except json.JSONDecodeError:
-                    pass
 
+    if json_events and stdout and not stdout.isspace():
+        response_text = _last_agent_message(stdout)
         # Only keep the response, not the full event log (can be 60k+ tokens)
         if response_text:
             structured["response"] = response_text
-        structured["event_count"] = event_count
+        # One event per line; counting line starts avoids parsing them all.
+        # Only the tail survives a capped capture, so there is no true count.
+        if not stdout_dropped:
+            structured["event_count"] = stdout.count("\n{") + stdout.startswith("{")
 
     # Truncate stdout to avoid context blowup (test output can be huge)
-    max_stdout = 2000
-    truncated_stdout = stdout[:max_stdout]
-    if len(stdout) > max_stdout:
-        truncated_stdout += f"\n... [truncated {len(stdout) - max_stdout} chars]"
+    truncated_stdout = truncate_output(stdout)
 
-    return AgentResult(
+    # Every field is already the right type here, so skip validation
+    return AgentResult.model_construct(
         agent="codex",
         cwd=cwd,
         ok=exit_code == 0,
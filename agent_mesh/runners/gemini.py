@@ -1,10 +1,14 @@
 """Gemini CLI runner."""
 
-import json
+import orjson
 
-from agent_mesh.runners.base import run_subprocess
+from agent_mesh.runners.base import run_subprocess, truncate_output
 from agent_mesh.types import AgentResult, Usage
 
+# Gemini CLI uses positional prompt and --output-format for JSON
+# --yolo auto-approves shell commands (required for headless execution)
+_BASE_CMD = ("gemini", "--yolo", "--output-format", "json")
+
 
 async def run_gemini(prompt: str, cwd: str, timeout_s: int = 1800) -> AgentResult:
     """Run Gemini CLI in headless mode.
@@ -12,30 +16,21 @@ async def run_gemini(prompt: str, cwd: str, timeout_s: int = 1800) -> AgentResul
     This runs a full agentic workflow (not a single LLM call), which includes
     tool use, retries, and I/O. The default 30min timeout accounts for this.
     """
-    # Gemini CLI uses positional prompt and --output-format for JSON
-    # --yolo auto-approves shell commands (required for headless execution)
-    cmd = [
-        "gemini",
-        "--yolo",
-        "--output-format",
-        "json",
-        prompt,
-    ]
+    cmd = [*_BASE_CMD, prompt]
 
-    exit_code, stdout, stderr, started_at, ended_at = await run_subprocess(
+    exit_code, stdout, stderr, started_at, ended_at, duration_ms, _ = await run_subprocess(
         cmd, cwd, timeout_s
     )
 
-    duration_ms = int((ended_at - started_at).total_seconds() * 1000)
-
     # Gemini outputs JSON in headless mode
     structured: dict = {}
     usage = Usage()
     has_error = False
 
-    if exit_code == 0 and stdout.strip():
+    # isspace() answers the same question as strip() without copying stdout
+    if exit_code == 0 and stdout and not stdout.isspace():
         try:
-            data = json.loads(stdout)
+            data = orjson.loads(stdout)
             # Only keep essential fields, not full conversation history
             if "response" in data:
                 structured["response"] = data["response"]
@@ -49,21 +44,15 @@ async def run_gemini(prompt: str, cwd: str, timeout_s: int = 1800) -> AgentResul
                     output_tokens=data["stats"].get("outputTokens"),
                 )
                 structured["stats"] = data["stats"]
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Gemini might output plain text in some modes - truncate if huge
-            max_raw = 2000
-            raw = stdout.strip()[:max_raw]
-            if len(stdout.strip()) > max_raw:
-                raw += f"\n... [truncated {len(stdout.strip()) - max_raw} chars]"
-            structured = {"response": raw}
+            structured = {"response": truncate_output(stdout.strip())}
 
     # Truncate stdout to avoid context blowup
-    max_stdout = 2000
-    truncated_stdout = stdout[:max_stdout]
-    if len(stdout) > max_stdout:
-        truncated_stdout += f"\n... [truncated {len(stdout) - max_stdout} chars]"
+    truncated_stdout = truncate_output(stdout)
 
-    return AgentResult(
+    # Every field is already the right type here, so skip validation
+    return AgentResult.model_construct(
         agent="gemini",
         cwd=cwd,
         ok=(exit_code == 0 and not has_error),
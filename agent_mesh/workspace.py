@@ -1,87 +1,305 @@
 """Workspace utilities for git operations."""
 
 import asyncio
+import contextlib
+import io
+import logging
+import os
+import re
+import stat
+import subprocess
 from pathlib import Path
 
+from agent_mesh.runners.base import resolve_cwd
 
-async def capture_git_diff(cwd: str, include_untracked: bool = True) -> str:
-    """Capture git diff (staged + unstaged + untracked) in the working directory.
+logger = logging.getLogger(__name__)
 
-    Args:
-        cwd: Working directory
-        include_untracked: If True, include content of untracked files as pseudo-diffs
-    """
-    cwd_path = Path(cwd).resolve()
+# Object id of the empty tree; diffing against it stands in for HEAD in a
+# repository that has no commits yet
+_EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+# Past these sizes a diff is too big to be useful in a prompt, so only a
+# summary is captured
+_MAX_DIFF_FILES = 50
+_MAX_DIFF_LINES = 20_000
+# Hard cap on captured diff bytes, for the case the line count can't see
+# (e.g. a few enormous lines)
+_MAX_DIFF_BYTES = 16 * 1024 * 1024
+# Per-read size for the diff, also used as the StreamReader limit so the
+# transport buffers up to 2x this before pausing; a large diff then takes
+# a few reads per MiB rather than one per 64 KiB pipe fill
+_READ_CHUNK = 1024 * 1024
+# Untracked files larger than this are listed but not inlined
+_MAX_UNTRACKED_BYTES = 1024 * 1024
+
+# Bound on the short git commands (status, shortstat, rev-parse): one stuck
+# on a held index.lock or a hook would otherwise block its caller for good
+_GIT_QUICK_TIMEOUT_S = 10
+
+_SHORTSTAT_RE = re.compile(rb"(\d+) (file|insertion|deletion)")
 
-    # Check if it's a git repo (works in subdirectories too)
+
+async def _git(cwd: str, *args: str) -> tuple[int, bytes]:
+    """Run a git subcommand in cwd, returning (exit_code, stdout)."""
     proc = await asyncio.create_subprocess_exec(
-        "git", "rev-parse", "--is-inside-work-tree",
-        cwd=str(cwd_path),
+        "git", *args,
+        cwd=cwd,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
     stdout, _ = await proc.communicate()
-    if proc.returncode != 0 or stdout.decode().strip() != "true":
-        return ""
+    return proc.returncode or 0, stdout
+
 
-    parts: list[str] = []
+async def _git_bounded(cwd: str, *args: str, limit: int) -> tuple[bytes, bool]:
+    """Run a git subcommand, keeping at most `limit` bytes of its stdout.
 
-    # Get combined diff (unstaged + staged)
+    Returns (stdout, truncated). Output is read in chunks and git is killed
+    once the limit is passed, so a runaway diff can't exhaust memory.
+    """
     proc = await asyncio.create_subprocess_exec(
-        "git", "diff", "HEAD",
-        cwd=str(cwd_path),
+        "git", *args,
+        cwd=cwd,
         stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        limit=_READ_CHUNK,
     )
-    stdout, _ = await proc.communicate()
-    diff = stdout.decode("utf-8", errors="replace")
-    if diff.strip():
-        parts.append(diff)
+    assert proc.stdout is not None
+    buf = bytearray()
+    try:
+        while len(buf) <= limit:
+            chunk = await proc.stdout.read(_READ_CHUNK)
+            if not chunk:
+                break
+            buf += chunk
+    finally:
+        # Over the limit, or the caller was cancelled: stop git mid-write
+        if not proc.stdout.at_eof():
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+        await proc.wait()
+    return bytes(buf[:limit]), len(buf) > limit
 
-    # Also include untracked files as pseudo-diffs
+
+async def _git_quick(cwd: str, *args: str) -> tuple[int, bytes]:
+    """Like _git, for commands that finish fast with small output.
+
+    A blocking subprocess.run on a worker thread skips the event loop's
+    subprocess transport setup, which costs more than these commands do.
+    The thread can't be cancelled, so git is given _GIT_QUICK_TIMEOUT_S
+    instead; past that it is killed and (-1, b"") returned.
+    """
+    try:
+        proc = await asyncio.to_thread(
+            subprocess.run,
+            ["git", *args],
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=_GIT_QUICK_TIMEOUT_S,
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning("git %s timed out after %ss in %s", " ".join(args), _GIT_QUICK_TIMEOUT_S, cwd)
+        return -1, b""
+    return proc.returncode, proc.stdout
+
+
+def _parse_shortstat(out: bytes) -> tuple[int, int]:
+    """Parse `git diff --shortstat` into (files changed, lines added + removed)."""
+    counts = {kind: int(n) for n, kind in _SHORTSTAT_RE.findall(out)}
+    return counts.get(b"file", 0), counts.get(b"insertion", 0) + counts.get(b"deletion", 0)
+
+
+# Subdirectory -> top level of the work tree it is in, so later calls from
+# the same place confirm it with an lstat of `<top>/.git` instead of running
+# git. Negative answers aren't kept, since `git init` can turn one into a repo.
+_repo_roots: dict[str, str] = {}
+
+
+def _clear_repo_cache() -> None:
+    """Forget every remembered work tree (for tests)."""
+    _repo_roots.clear()
+
+
+async def _is_git_repo(cwd: str) -> bool:
+    # A `.git` entry (a directory, or a file for worktrees and submodules)
+    # at cwd settles it with one lstat
+    if os.path.lexists(os.path.join(cwd, ".git")):
+        return True
+    root = _repo_roots.get(cwd)
+    if root is not None and os.path.lexists(os.path.join(root, ".git")):
+        return True
+    # Otherwise ask git, which also handles subdirectories; it refuses
+    # outside a work tree, including inside .git itself
+    returncode, stdout = await _git_quick(cwd, "rev-parse", "--show-toplevel")
+    if returncode != 0:
+        _repo_roots.pop(cwd, None)
+        return False
+    _repo_roots[cwd] = os.fsdecode(stdout.rstrip(b"\n"))
+    return True
+
+
+async def _head_diff(cwd: str) -> bytes:
+    """Combined diff (unstaged + staged) against HEAD.
+
+    A --shortstat probe runs first: an empty change set needs no full diff,
+    and one too large to be useful is replaced by a one-line summary. Only
+    a failed probe (no HEAD yet) needs a second spawn.
+    """
+    base = "HEAD"
+    returncode, shortstat = await _git_quick(cwd, "diff", "--shortstat", base, "--")
+    if returncode != 0:
+        base = _EMPTY_TREE
+        _, shortstat = await _git_quick(cwd, "diff", "--shortstat", base, "--")
+
+    files, changes = _parse_shortstat(shortstat)
+    if not files:
+        return b""
+    if files > _MAX_DIFF_FILES or changes > _MAX_DIFF_LINES:
+        return f"[diff omitted: {files} files changed, {changes} lines changed]".encode()
+
+    stdout, truncated = await _git_bounded(cwd, "diff", base, "--", limit=_MAX_DIFF_BYTES)
+    if truncated:
+        stdout += f"\n[diff truncated at {_MAX_DIFF_BYTES} bytes]".encode()
+    return stdout
+
+
+async def capture_git_diff(cwd: str, include_untracked: bool = True) -> str:
+    """Capture git diff (staged + unstaged + untracked) in the working directory.
+
+    Args:
+        cwd: Working directory
+        include_untracked: If True, include content of untracked files as pseudo-diffs
+    """
+    cwd = resolve_cwd(cwd)
+    cwd_path = Path(cwd)
+
+    if not await _is_git_repo(cwd):
+        return ""
+
+    # Sections go straight into one buffer, newline-separated
+    out = io.StringIO()
+
+    # The diff and the untracked listing are independent; run them concurrently
     if include_untracked:
-        proc = await asyncio.create_subprocess_exec(
-            "git", "ls-files", "--others", "--exclude-standard",
-            cwd=str(cwd_path),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        diff_out, (_, ls_out) = await asyncio.gather(
+            _head_diff(cwd),
+            _git(cwd, "ls-files", "-z", "--others", "--exclude-standard"),
         )
-        stdout, _ = await proc.communicate()
-        untracked = stdout.decode("utf-8", errors="replace").strip().split("\n")
+    else:
+        diff_out = await _head_diff(cwd)
 
-        for filename in untracked:
-            if not filename:
+    # Test for an empty diff on the raw bytes; decode only what is kept
+    if diff_out.strip():
+        out.write(diff_out.decode("utf-8", errors="replace"))
+
+    # Also include untracked files as pseudo-diffs
+    if include_untracked:
+        # -z gives raw NUL-separated paths; without it git C-quotes any name
+        # with non-ASCII or special characters, which then doesn't exist
+        for raw_name in ls_out.split(b"\0"):
+            if not raw_name:
+                continue
+            filepath = cwd_path / os.fsdecode(raw_name)
+            filename = raw_name.decode("utf-8", errors="replace")
+            # One stat answers exists, is-a-file and size; ls-files already
+            # listed the path, so a vanished file is the rare case
+            try:
+                st = filepath.stat()
+            except OSError:
                 continue
-            filepath = cwd_path / filename
-            if filepath.exists() and filepath.is_file():
+            if stat.S_ISREG(st.st_mode):
+                size = st.st_size
+                if size > _MAX_UNTRACKED_BYTES:
+                    # A marker line of its own rather than a half-formed
+                    # diff section
+                    if out.tell():
+                        out.write("\n")
+                    out.write(f"[untracked file omitted: {filename}, {size} bytes]")
+                    continue
                 try:
-                    content = filepath.read_text(errors="replace")
-                    # Format as a pseudo-diff for new file
-                    lines = content.split("\n")
-                    diff_lines = [f"+{line}" for line in lines]
-                    parts.append(
+                    # Format as a pseudo-diff for new file, streaming lines
+                    # straight into one buffer instead of building lists
+                    body = io.StringIO()
+                    n_lines = 0
+                    last = "\n"
+                    with filepath.open(errors="replace") as f:
+                        for line in f:
+                            body.write("+")
+                            body.write(line)
+                            n_lines += 1
+                            last = line
+                    # Count the (empty) segment after a trailing newline as
+                    # a line too, as splitting the content on "\n" would
+                    if last.endswith("\n"):
+                        body.write("+")
+                        n_lines += 1
+                    if out.tell():
+                        out.write("\n")
+                    out.write(
                         f"diff --git a/{filename} b/{filename}\n"
                         f"new file mode 100644\n"
                         f"--- /dev/null\n"
                         f"+++ b/{filename}\n"
-                        f"@@ -0,0 +1,{len(lines)} @@\n"
-                        + "\n".join(diff_lines)
+                        f"@@ -0,0 +1,{n_lines} @@\n"
                     )
-                except Exception:
-                    pass
+                    out.write(body.getvalue())
+                except OSError as e:
+                    # Deleted, unreadable, etc. since ls-files listed it
+                    logger.debug("skipping untracked %s: %s", filename, e)
+
+    return out.getvalue()
+
 
-    return "\n".join(parts)
+async def _git_status(cwd: str) -> bytes:
+    if not await _is_git_repo(cwd):
+        return b""
+    _, stdout = await _git_quick(cwd, "status", "--porcelain")
+    return stdout
+
+
+# cwd -> the `git status` currently running there. Concurrent callers share
+# one run; the entry goes away as soon as it finishes, so a finished result
+# is never reused (working-tree edits don't touch anything cheap to check).
+_status_inflight: dict[str, asyncio.Future[bytes]] = {}
 
 
 async def capture_git_status(cwd: str) -> str:
     """Capture git status in porcelain format."""
-    cwd_path = Path(cwd).resolve()
+    status = await capture_git_status_bytes(cwd)
+    return status.decode("utf-8", errors="replace")
 
-    proc = await asyncio.create_subprocess_exec(
-        "git", "status", "--porcelain",
-        cwd=str(cwd_path),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+
+async def capture_git_status_bytes(cwd: str) -> bytes:
+    """Capture git status in porcelain format, undecoded.
+
+    For callers that only test entries (e.g. `line.startswith(b"??")`),
+    which don't need the whole listing decoded first.
+
+    Calls for the same directory that overlap share a single `git status`.
+    """
+    cwd = resolve_cwd(cwd)
+
+    fut = _status_inflight.get(cwd)
+    if fut is None:
+        fut = asyncio.ensure_future(_git_status(cwd))
+        _status_inflight[cwd] = fut
+
+        def _settle(done: asyncio.Future[bytes]) -> None:
+            if _status_inflight.get(cwd) is done:
+                del _status_inflight[cwd]
+
+        fut.add_done_callback(_settle)
+
+    # Shielded so one caller going away doesn't cancel it for the others
+    return await asyncio.shield(fut)
+
+
+async def capture_git_artifacts(cwd: str, include_untracked: bool = True) -> tuple[str, str]:
+    """Capture (diff, status) concurrently, for callers that need both."""
+    diff, status = await asyncio.gather(
+        capture_git_diff(cwd, include_untracked=include_untracked),
+        capture_git_status(cwd),
     )
-    stdout, _ = await proc.communicate()
-    return stdout.decode("utf-8", errors="replace")
+    return diff, status
+
@@ -0,0 +1,145 @@
+"""Shared fixtures for the agent-mesh test suite."""
+
+import asyncio
+import itertools
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import orjson
+import pytest
+import pytest_asyncio
+
+# A tool call response carries a whole AgentResult on one line, which can
+# exceed StreamReader's 64 KiB default and make readuntil() fail
+_MAX_LINE_BYTES = 16 * 1024 * 1024
+
+_INIT_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {},
+    "clientInfo": {"name": "test", "version": "1.0.0"},
+}
+
+
+class McpSession:
+    """A running MCP server, initialized once and shared by the MCP tests.
+
+    Each request gets a fresh JSON-RPC id, and responses are matched by id,
+    so tests don't depend on each other's traffic.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.init_response: dict = {}
+        # Server logs, drained in the background so a chatty server can't
+        # fill the pipe and stall mid-response
+        self.stderr = bytearray()
+        self._ids = itertools.count(1)
+
+    async def drain_stderr(self) -> None:
+        while chunk := await self.proc.stderr.read(65536):
+            self.stderr += chunk
+
+    async def rpc(self, method: str, params: dict | None = None, timeout: float = 5.0) -> dict:
+        """Send one JSON-RPC request and return the response with its id."""
+        request_id = next(self._ids)
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        self.proc.stdin.write(orjson.dumps(message) + b"\n")
+        await self.proc.stdin.drain()
+
+        while True:
+            try:
+                line = await asyncio.wait_for(self.proc.stdout.readuntil(b"\n"), timeout=timeout)
+            except asyncio.IncompleteReadError as e:
+                # readline() would hand back the partial line and fail later
+                # in the JSON parse; say what actually happened
+                raise AssertionError(
+                    f"MCP server closed stdout (got {e.partial!r}); "
+                    f"stderr tail: {bytes(self.stderr[-2000:])!r}"
+                ) from e
+            try:
+                response = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                # Anything but JSON-RPC on stdout breaks MCP clients
+                raise AssertionError(f"stdout contains non-JSON data: {line!r}") from e
+            if response.get("id") == request_id:
+                return response
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def mcp_session():
+    """Start the MCP server once per session and complete the initialize handshake."""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "agent_mesh.mcp_server",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=Path(__file__).parent.parent,
+        limit=_MAX_LINE_BYTES,
+    )
+    session = McpSession(proc)
+    stderr_task = asyncio.create_task(session.drain_stderr())
+
+    try:
+        session.init_response = await session.rpc("initialize", _INIT_PARAMS)
+        yield session
+    finally:
+        # MCP has no shutdown request; over stdio, closing stdin is the
+        # shutdown signal, followed by SIGTERM and then SIGKILL if ignored
+        proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=2.0)
+        except asyncio.TimeoutError:
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+        # The server has exited, so this reaches EOF unless a grandchild
+        # still holds the pipe
+        try:
+            await asyncio.wait_for(stderr_task, timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+@pytest.fixture(scope="session")
+def git_repo_template(tmp_path_factory):
+    """Build the template repository once; temp_git_repo hands out copies.
+
+    Under pytest-xdist each worker builds its own, in its own basetemp.
+    """
+    repo_path = tmp_path_factory.mktemp("git-template")
+    (repo_path / "README.md").write_text("# Test Repo\n")
+
+    # One shell for init, identity and the initial commit. The identity is
+    # appended to .git/config (not passed with -c) so every copy keeps it.
+    subprocess.run(
+        [
+            "sh", "-c",
+            "set -e; git init -q; "
+            "printf '[user]\\n\\temail = test@example.com\\n\\tname = Test User\\n' >> .git/config; "
+            "git add .; git commit -q -m 'Initial commit'",
+        ],
+        cwd=repo_path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    return repo_path
+
+
+@pytest.fixture
+def temp_git_repo(git_repo_template):
+    """Create a temporary git repository for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        shutil.copytree(git_repo_template, tmpdir, dirs_exist_ok=True)
+        yield tmpdir
@@ -0,0 +1,41 @@
+"""Availability checks shared by the e2e test modules.
+
+Each is evaluated once per process (so once per xdist worker) and used in
+skipif conditions at import time.
+"""
+
+import functools
+import os
+import shutil
+import subprocess
+
+
+@functools.cache
+def has_claude_cli() -> bool:
+    """Check if claude CLI is available."""
+    # In-process PATH scan; evaluated once rather than forking `which` per skipif
+    return shutil.which("claude") is not None
+
+
+@functools.cache
+def has_codex_cli() -> bool:
+    """Check if codex CLI is available."""
+    if shutil.which("codex") is not None:
+        return True
+    try:
+        # Codex might be a shell function, check via bash
+        result = subprocess.run(
+            ["bash", "-c", "command -v codex"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=5,
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+@functools.cache
+def has_gemini_api_key() -> bool:
+    """Check if GEMINI_API_KEY is set."""
+    return bool(os.environ.get("GEMINI_API_KEY"))
@@ -0,0 +1,104 @@
+"""Tests for agent_mesh.doctor (no real LLM calls)."""
+
+import asyncio
+from datetime import datetime, timezone
+
+from agent_mesh import doctor
+from agent_mesh.types import AgentResult
+
+
+def _result(agent: str, **structured) -> AgentResult:
+    now = datetime.now(timezone.utc)
+    return AgentResult(
+        agent=agent,
+        cwd="/tmp",
+        ok=True,
+        exit_code=0,
+        started_at=now,
+        ended_at=now,
+        duration_ms=10,
+        stdout="",
+        stderr="",
+        structured=structured,
+    )
+
+
+async def test_run_smoke_runs_agents_concurrently(monkeypatch):
+    """All agents should be in flight at the same time."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_run_agent(agent: str, prompt: str, cwd: str, timeout_s: int) -> AgentResult:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return _result(agent, response="4")
+
+    monkeypatch.setattr(doctor, "run_agent", fake_run_agent)
+
+    results = await doctor.run_smoke(agents=["codex", "gemini"])
+
+    assert peak == 2
+    assert list(results) == ["codex", "gemini"]
+    assert all(r["ok"] and r["response"] == "4" for r in results.values())
+
+
+async def test_run_smoke_reports_exceptions_per_agent(monkeypatch):
+    """One agent raising must not lose the other agents' results."""
+
+    async def fake_run_agent(agent: str, prompt: str, cwd: str, timeout_s: int) -> AgentResult:
+        if agent == "claude":
+            raise RuntimeError("boom")
+        return _result(agent, response="4")
+
+    monkeypatch.setattr(doctor, "run_agent", fake_run_agent)
+
+    results = await doctor.run_smoke(agents=["claude", "codex"])
+
+    assert results["claude"]["ok"] is False
+    assert "boom" in results["claude"]["stderr"]
+    assert results["codex"]["ok"] is True
+
+
+async def test_check_binaries_caches_version_probe(monkeypatch, tmp_path):
+    """A second check_binaries() call must not re-run `--version`."""
+    for name in ["claude", "codex", "gemini"]:
+        exe = tmp_path / name
+        exe.write_text("#!/bin/sh\necho 1.0.0\n")
+        exe.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    calls: list[str] = []
+    real_run_version = doctor._run_version
+
+    async def counting_run_version(cmd: str) -> str | None:
+        calls.append(cmd)
+        return await real_run_version(cmd)
+
+    monkeypatch.setattr(doctor, "_run_version", counting_run_version)
+    monkeypatch.setattr(doctor, "_version_cache", {})
+
+    first = await doctor.check_binaries()
+    second = await doctor.check_binaries()
+
+    assert len(calls) == 3
+    assert first["claude"].version == second["claude"].version == "1.0.0"
+
+
+def test_extract_response_text_per_agent():
+    assert doctor._extract_response_text(_result("codex", response="  4\n")) == "4"
+    assert doctor._extract_response_text(_result("claude", result="", output="4")) == "4"
+    assert doctor._extract_response_text(
+        _result("gemini", candidates=[{"content": {"parts": [{"text": " 4 "}]}}])
+    ) == "4"
+    assert doctor._extract_response_text(_result("unknown", response="4")) is None
+
+
+async def test_check_mcp_server_tools():
+    """The real MCP server answers the pipelined initialize + tools/list."""
+    result = await doctor.check_mcp_server_tools(timeout_s=10)
+
+    assert result.ok, result.error
+    assert {"claude_run", "codex_exec", "gemini_run"} <= set(result.tools)
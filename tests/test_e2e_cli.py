@@ -0,0 +1,65 @@
+"""End-to-end tests for the agent-mesh command line."""
+
+import subprocess
+from pathlib import Path
+
+import orjson
+import pytest
+
+from tests.helpers import has_claude_cli
+
+pytestmark = pytest.mark.e2e
+
+
+def test_cli_version():
+    """Test agent-mesh version command."""
+    result = subprocess.run(
+        ["uv", "run", "agent-mesh", "version"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        cwd=Path(__file__).parent.parent,
+    )
+    assert result.returncode == 0
+    assert "agent-mesh" in result.stdout
+    assert "0.1.0" in result.stdout
+
+
+def test_cli_help():
+    """Test agent-mesh --help command."""
+    result = subprocess.run(
+        ["uv", "run", "agent-mesh", "--help"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        cwd=Path(__file__).parent.parent,
+    )
+    assert result.returncode == 0
+    assert "run" in result.stdout
+    assert "pipeline" in result.stdout
+    assert "version" in result.stdout
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not has_claude_cli(), reason="claude CLI not available")
+def test_cli_run_claude(temp_git_repo):
+    """Test agent-mesh run --agent claude command."""
+    result = subprocess.run(
+        [
+            "uv", "run", "agent-mesh", "run",
+            "--agent", "claude",
+            "--prompt", "Reply with exactly: CLI_TEST_PASSED",
+            "--timeout", "60",
+            "--cwd", str(temp_git_repo),
+        ],
+        capture_output=True,
+        text=True,
+        timeout=90,
+        cwd=Path(__file__).parent.parent,
+    )
+    assert result.returncode == 0
+
+    # Should output valid JSON
+    data = orjson.loads(result.stdout)
+    assert data["agent"] == "claude"
+    assert "ok" in data
@@ -0,0 +1,214 @@
+"""End-to-end integration tests for agent-mesh with REAL LLM calls.
+
+These tests make actual API calls and cost money/time. They test the full
+integration of runners, MCP server, and agent-to-agent communication; the
+suite is split by area across the tests/test_e2e_*.py modules.
+
+Run with: uv run pytest tests/test_e2e_*.py -v --tb=short
+Skip slow tests: uv run pytest tests/test_e2e_*.py -v -m "not slow"
+In parallel: uv run pytest tests/test_e2e_*.py -n auto -m e2e
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from agent_mesh.runners import claude
+from agent_mesh.runners.base import run_agent
+from agent_mesh.types import AgentResult
+from tests.helpers import has_claude_cli, has_codex_cli, has_gemini_api_key
+
+pytestmark = pytest.mark.e2e
+
+
+_RUNNER_PROMPTS = {
+    "claude": "What is 2+2? Reply with just the number.",
+    "codex": "What is the capital of France? Reply with just the city name.",
+    "gemini": "What is 10+10? Reply with just the number.",
+}
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def real_runner_results():
+    """Run every available agent's real call concurrently, once.
+
+    The calls are independent and network-bound, so the runner tests wait
+    for the slowest agent rather than the sum of all three.
+    """
+    available = {
+        "claude": has_claude_cli(),
+        "codex": has_codex_cli(),
+        "gemini": has_gemini_api_key(),
+    }
+    agents = [agent for agent, ok in available.items() if ok]
+    # One agent raising must not take down the other agents' tests
+    results = await asyncio.gather(
+        *(run_agent(agent=agent, prompt=_RUNNER_PROMPTS[agent], cwd=".", timeout_s=60) for agent in agents),
+        return_exceptions=True,
+    )
+    return dict(zip(agents, results))
+
+
+def _agent_result(results: dict, agent: str) -> AgentResult:
+    """Return an agent's result, re-raising its exception in its own test."""
+    result = results[agent]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not has_claude_cli(), reason="claude CLI not available")
+@pytest.mark.asyncio(loop_scope="session")
+async def test_claude_runner_real_call(real_runner_results):
+    """Test Claude runner with a real API call."""
+    result = _agent_result(real_runner_results, "claude")
+
+    # Verify result structure
+    assert isinstance(result, AgentResult)
+    assert result.agent == "claude"
+    assert result.mode == "headless"
+    assert result.cwd is not None
+    assert isinstance(result.exit_code, int)
+    assert isinstance(result.duration_ms, int)
+    assert result.duration_ms > 0
+
+    # Should succeed (assuming API is working)
+    if result.ok:
+        assert result.exit_code == 0
+        assert len(result.stdout) > 0
+        print(f"\n✓ Claude responded in {result.duration_ms}ms")
+        print(f"  Response length: {len(result.stdout)} chars")
+        if result.usage.output_tokens:
+            print(f"  Tokens: {result.usage.input_tokens} in, {result.usage.output_tokens} out")
+    else:
+        # If it fails, print diagnostics but don't fail test (might be auth issue)
+        print(f"\n⚠ Claude call failed (exit {result.exit_code})")
+        print(f"  stderr: {result.stderr[:200]}")
+        pytest.skip("Claude CLI authentication or connection issue")
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not has_codex_cli(), reason="codex CLI not available")
+@pytest.mark.asyncio(loop_scope="session")
+async def test_codex_runner_real_call(real_runner_results):
+    """Test Codex runner with a real API call."""
+    result = _agent_result(real_runner_results, "codex")
+
+    # Verify result structure
+    assert isinstance(result, AgentResult)
+    assert result.agent == "codex"
+    assert result.mode == "headless"
+    assert result.cwd is not None
+    assert isinstance(result.exit_code, int)
+    assert isinstance(result.duration_ms, int)
+    assert result.duration_ms > 0
+
+    # Should succeed
+    if result.ok:
+        assert result.exit_code == 0
+        assert len(result.stdout) > 0
+        print(f"\n✓ Codex responded in {result.duration_ms}ms")
+        print(f"  Response length: {len(result.stdout)} chars")
+
+        # Check for JSONL events
+        if result.structured and "events" in result.structured:
+            print(f"  Events: {len(result.structured['events'])}")
+    else:
+        print(f"\n⚠ Codex call failed (exit {result.exit_code})")
+        print(f"  stderr: {result.stderr[:200]}")
+        pytest.skip("Codex CLI authentication or connection issue")
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not has_gemini_api_key(), reason="GEMINI_API_KEY not set")
+@pytest.mark.asyncio(loop_scope="session")
+async def test_gemini_runner_real_call(real_runner_results):
+    """Test Gemini runner with a real API call (skipped if no API key)."""
+    result = _agent_result(real_runner_results, "gemini")
+
+    # Verify result structure
+    assert isinstance(result, AgentResult)
+    assert result.agent == "gemini"
+    assert result.mode == "headless"
+    assert result.cwd is not None
+    assert isinstance(result.exit_code, int)
+    assert isinstance(result.duration_ms, int)
+
+    if result.ok:
+        assert result.exit_code == 0
+        print(f"\n✓ Gemini responded in {result.duration_ms}ms")
+        print(f"  Response length: {len(result.stdout)} chars")
+    else:
+        print(f"\n⚠ Gemini call failed (exit {result.exit_code})")
+        print(f"  stderr: {result.stderr[:200]}")
+        pytest.skip("Gemini CLI or API key issue")
+
+
+@pytest.mark.parametrize(
+    ("agent", "expected"),
+    [
+        ("claude", "timeout"),
+        ("nonexistent", "unknown agent"),
+    ],
+    ids=["timeout", "invalid-agent"],
+)
+async def test_run_agent_error_paths(agent, expected, monkeypatch):
+    """Test timeout enforcement and invalid agent names without a real CLI."""
+    # Stand-in for `claude` that just hangs; sh takes the CLI's arguments as $@
+    monkeypatch.setattr(claude, "_BASE_CMD", ("sh", "-c", "sleep 5", "--"))
+
+    result = await run_agent(
+        agent=agent,
+        prompt="test",
+        cwd=".",
+        timeout_s=1,
+    )
+
+    assert not result.ok
+    assert result.exit_code != 0
+    assert expected in result.stderr.lower()
+    print(f"\n✓ {agent}: {expected} reported after {result.duration_ms}ms")
+
+
+def test_e2e_summary():
+    """Print summary of what e2e tests cover."""
+    print("\n" + "=" * 70)
+    print("E2E Test Coverage Summary")
+    print("=" * 70)
+    print("\n✓ Runner Tests:")
+    print("  - Claude runner with real API call")
+    print("  - Codex runner with real API call")
+    print("  - Gemini runner with real API call (if API key present)")
+    print("  - Timeout handling")
+    print("  - Invalid agent error handling")
+    print("\n✓ MCP Server Tests:")
+    print("  - Server initialization")
+    print("  - Tools discovery (all 3 tools)")
+    print("  - claude_run tool call with real API")
+    print("  - codex_exec tool call with real API")
+    print("\n✓ Pipeline Tests:")
+    print("  - Review pipeline (Claude → git diff → Codex)")
+    print("\n✓ CLI Tests:")
+    print("  - agent-mesh version")
+    print("  - agent-mesh --help")
+    print("  - agent-mesh run --agent claude")
+    print("\n✓ Workspace Tests:")
+    print("  - capture_git_diff with untracked files")
+    print("  - capture_git_diff with non-ASCII untracked file names")
+    print("  - capture_git_diff without untracked files")
+    print("  - capture_git_diff from a subdirectory")
+    print("  - capture_git_diff with staged changes")
+    print("  - capture_git_diff in a repo with no commits")
+    print("  - capture_git_diff size limits")
+    print("  - capture_git_diff byte cap")
+    print("  - capture_git_status")
+    print("  - capture_git_status coalescing of overlapping calls")
+    print("  - capture_git_status_bytes")
+    print("  - capture_git_artifacts (diff + status)")
+    print("  - Non-git directory handling")
+    print("\n✓ Cross-Agent Tests:")
+    print("  - MCP registration verification")
+    print("  - Note: Full agent-to-agent requires manual MCP setup")
+    print("\n" + "=" * 70)
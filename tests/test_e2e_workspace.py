@@ -0,0 +1,255 @@
+"""End-to-end tests for git workspace capture against real repositories."""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from agent_mesh import workspace
+
+pytestmark = pytest.mark.e2e
+
+
+@pytest.fixture(autouse=True)
+def _fresh_repo_cache():
+    """Each test starts without work trees remembered by earlier ones."""
+    workspace._clear_repo_cache()
+    yield
+    workspace._clear_repo_cache()
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_untracked(temp_git_repo):
+    """Test capture_git_diff includes untracked files."""
+    from agent_mesh.workspace import capture_git_diff
+
+    # Create an untracked file
+    (Path(temp_git_repo) / "new_file.py").write_text("print('hello')\n")
+
+    diff = await capture_git_diff(temp_git_repo, include_untracked=True)
+
+    assert "new_file.py" in diff
+    assert "+print('hello')" in diff
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_untracked_special_names(temp_git_repo):
+    """Test capture_git_diff includes untracked files with non-ASCII names."""
+    from agent_mesh.workspace import capture_git_diff
+
+    (Path(temp_git_repo) / "café.py").write_text("print('bonjour')\n")
+
+    diff = await capture_git_diff(temp_git_repo, include_untracked=True)
+
+    assert "b/café.py" in diff
+    assert "+print('bonjour')" in diff
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_subdirectory(temp_git_repo):
+    """Test capture_git_diff from a subdirectory of the work tree."""
+    from agent_mesh.workspace import capture_git_diff
+
+    (Path(temp_git_repo) / "README.md").write_text("# Changed\n")
+    subdir = Path(temp_git_repo) / "pkg"
+    subdir.mkdir()
+
+    diff = await capture_git_diff(str(subdir), include_untracked=False)
+
+    assert "+# Changed" in diff
+
+
+@pytest.mark.asyncio
+async def test_workspace_repo_cache_notices_removed_git_dir(temp_git_repo):
+    """Test a remembered subdirectory stops counting once .git is gone."""
+    subdir = Path(temp_git_repo) / "pkg"
+    subdir.mkdir()
+
+    assert await workspace._is_git_repo(str(subdir))
+    shutil.rmtree(Path(temp_git_repo) / ".git")
+    assert not await workspace._is_git_repo(str(subdir))
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_no_untracked(temp_git_repo):
+    """Test capture_git_diff without untracked files."""
+    from agent_mesh.workspace import capture_git_diff
+
+    # Create an untracked file
+    (Path(temp_git_repo) / "new_file.py").write_text("print('hello')\n")
+
+    diff = await capture_git_diff(temp_git_repo, include_untracked=False)
+
+    # Untracked file should NOT be in diff
+    assert "new_file.py" not in diff
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_staged_changes(temp_git_repo):
+    """Test capture_git_diff with staged changes."""
+    from agent_mesh.workspace import capture_git_diff
+
+    # Modify and stage a file
+    readme = Path(temp_git_repo) / "README.md"
+    readme.write_text("# Test Repo\n\nModified content.\n")
+    subprocess.run(["git", "add", "README.md"], cwd=temp_git_repo, check=True)
+
+    diff = await capture_git_diff(temp_git_repo)
+
+    assert "README.md" in diff
+    assert "+Modified content" in diff
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_no_commits():
+    """Test capture_git_diff in a repo without a HEAD commit yet."""
+    from agent_mesh.workspace import capture_git_diff
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        subprocess.run(["git", "init"], cwd=tmpdir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        (Path(tmpdir) / "staged.py").write_text("print('staged')\n")
+        subprocess.run(["git", "add", "staged.py"], cwd=tmpdir, check=True)
+
+        diff = await capture_git_diff(tmpdir, include_untracked=False)
+
+        assert "staged.py" in diff
+        assert "+print('staged')" in diff
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_artifacts(temp_git_repo):
+    """Test capture_git_artifacts returns both diff and status."""
+    from agent_mesh.workspace import capture_git_artifacts
+
+    (Path(temp_git_repo) / "new_file.py").write_text("print('hello')\n")
+
+    diff, status = await capture_git_artifacts(temp_git_repo)
+
+    assert "+print('hello')" in diff
+    assert "?? new_file.py" in status
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_omits_huge_changes(temp_git_repo, monkeypatch):
+    """Test capture_git_diff summarizes diffs and files past the size limits."""
+    from agent_mesh import workspace
+
+    monkeypatch.setattr(workspace, "_MAX_DIFF_LINES", 2)
+    monkeypatch.setattr(workspace, "_MAX_UNTRACKED_BYTES", 10)
+    (Path(temp_git_repo) / "README.md").write_text("one\ntwo\nthree\n")
+    (Path(temp_git_repo) / "big.txt").write_text("x" * 100)
+
+    diff = await workspace.capture_git_diff(temp_git_repo)
+
+    assert "[diff omitted: 1 files changed, 4 lines changed]" in diff
+    assert "+one" not in diff
+    assert "[untracked file omitted: big.txt, 100 bytes]" in diff
+    assert "b/big.txt" not in diff
+    assert "xxxx" not in diff
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_diff_truncates_huge_output(temp_git_repo, monkeypatch):
+    """Test capture_git_diff caps the bytes of a diff with few, long lines."""
+    from agent_mesh import workspace
+
+    monkeypatch.setattr(workspace, "_MAX_DIFF_BYTES", 200)
+    (Path(temp_git_repo) / "README.md").write_text("y" * 10_000 + "\n")
+
+    diff = await workspace.capture_git_diff(temp_git_repo, include_untracked=False)
+
+    assert diff.startswith("diff --git a/README.md b/README.md")
+    assert diff.endswith("[diff truncated at 200 bytes]")
+    assert len(diff) < 300
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_status(temp_git_repo, monkeypatch):
+    """Test capture_git_status returns porcelain output."""
+    from agent_mesh.workspace import capture_git_status
+
+    # Create an untracked file
+    (Path(temp_git_repo) / "new_file.py").write_text("print('hello')\n")
+
+    status = await capture_git_status(temp_git_repo)
+
+    assert "?? new_file.py" in status
+
+    # Relative paths are resolved against the process cwd
+    monkeypatch.chdir(temp_git_repo)
+    assert await capture_git_status(".") == status
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_status_bytes(temp_git_repo):
+    """Test capture_git_status_bytes returns undecoded porcelain output."""
+    from agent_mesh.workspace import capture_git_status_bytes
+
+    (Path(temp_git_repo) / "new_file.py").write_text("print('hello')\n")
+
+    status = await capture_git_status_bytes(temp_git_repo)
+
+    assert status.splitlines() == [b"?? new_file.py"]
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_status_coalesced(temp_git_repo, monkeypatch):
+    """Test capture_git_status shares one git run between overlapping calls only."""
+    from agent_mesh import workspace
+
+    calls = []
+    real_git = workspace._git_quick
+
+    async def counting_git(cwd, *args):
+        calls.append(args)
+        return await real_git(cwd, *args)
+
+    monkeypatch.setattr(workspace, "_git_quick", counting_git)
+    (Path(temp_git_repo) / "new_file.py").write_text("print('hello')\n")
+
+    first, second = await asyncio.gather(
+        workspace.capture_git_status(temp_git_repo),
+        workspace.capture_git_status(temp_git_repo),
+    )
+    assert first == second
+    assert "?? new_file.py" in first
+    assert len(calls) == 1
+
+    # A finished result is not reused: a later call sees new work-tree files
+    (Path(temp_git_repo) / "other.py").write_text("print('again')\n")
+    third = await workspace.capture_git_status(temp_git_repo)
+    assert "?? other.py" in third
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_workspace_git_status_times_out(temp_git_repo, tmp_path, monkeypatch):
+    """Test a hung git is killed and reported as an empty status."""
+    fake_git = tmp_path / "bin" / "git"
+    fake_git.parent.mkdir()
+    fake_git.write_text("#!/bin/sh\nexec sleep 30\n")
+    fake_git.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{fake_git.parent}:{os.environ['PATH']}")
+    monkeypatch.setattr(workspace, "_GIT_QUICK_TIMEOUT_S", 0.5)
+
+    status = await asyncio.wait_for(workspace.capture_git_status(temp_git_repo), timeout=10)
+
+    assert status == ""
+
+
+@pytest.mark.asyncio
+async def test_workspace_non_git_directory():
+    """Test workspace functions handle non-git directories."""
+    from agent_mesh.workspace import capture_git_diff, capture_git_status
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Not a git repo
+        diff = await capture_git_diff(tmpdir)
+        assert diff == ""
+
+        status = await capture_git_status(tmpdir)
+        assert status == ""
@@ -1,57 +1,22 @@
 """Test MCP server functionality."""
 
-import asyncio
-import json
-import subprocess
 import sys
-from pathlib import Path
 
+import pytest
 
-async def test_mcp_protocol():
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_mcp_protocol(mcp_session):
     """Test that the MCP server responds to basic protocol messages."""
-    # Start the MCP server
-    proc = await asyncio.create_subprocess_exec(
-        sys.executable,
-        "-m",
-        "agent_mesh.mcp_server",
-        stdin=asyncio.subprocess.PIPE,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        cwd=Path(__file__).parent.parent,
-    )
-
-    # Test 1: Initialize
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test", "version": "1.0.0"},
-        },
-    }
-
-    proc.stdin.write((json.dumps(init_request) + "\n").encode())
-    await proc.stdin.drain()
-
-    # Read response
-    line = await asyncio.wait_for(proc.stdout.readline(), timeout=5.0)
-    init_response = json.loads(line)
+    # Test 1: Initialize (done by the shared fixture)
+    init_response = mcp_session.init_response
 
     assert "result" in init_response, f"Initialize failed: {init_response}"
     assert init_response["result"]["serverInfo"]["name"] == "agent-mesh"
     print("✓ Server initializes correctly")
 
     # Test 2: List tools
-    list_tools_request = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
-
-    proc.stdin.write((json.dumps(list_tools_request) + "\n").encode())
-    await proc.stdin.drain()
-
-    # Read response
-    line = await asyncio.wait_for(proc.stdout.readline(), timeout=5.0)
-    tools_response = json.loads(line)
+    tools_response = await mcp_session.rpc("tools/list")
 
     assert "result" in tools_response, f"Tools list failed: {tools_response}"
     tools = tools_response["result"]["tools"]
@@ -68,10 +33,6 @@ async def test_mcp_protocol():
         assert "properties" in tool["inputSchema"], f"Tool {tool['name']} missing properties"
         print(f"✓ Tool {tool['name']} has valid schema")
 
-    # Clean shutdown
-    proc.stdin.close()
-    await asyncio.wait_for(proc.wait(), timeout=2.0)
-
     print("\n✅ All MCP protocol tests passed")
 
 
@@ -84,82 +45,34 @@ async def test_tool_call():
     # Verify functions exist and have correct signatures
     import inspect
 
-    sig = inspect.signature(claude_run)
-    assert "prompt" in sig.parameters
-    assert "cwd" in sig.parameters
-    assert "timeout_s" in sig.parameters
-    print("✓ claude_run has correct signature")
-
-    sig = inspect.signature(codex_exec)
-    assert "task" in sig.parameters
-    assert "cwd" in sig.parameters
-    assert "timeout_s" in sig.parameters
-    print("✓ codex_exec has correct signature")
-
-    sig = inspect.signature(gemini_run)
-    assert "prompt" in sig.parameters
-    assert "cwd" in sig.parameters
-    assert "timeout_s" in sig.parameters
-    print("✓ gemini_run has correct signature")
+    expected = [
+        (claude_run, {"prompt", "cwd", "timeout_s"}),
+        (codex_exec, {"task", "cwd", "timeout_s"}),
+        (gemini_run, {"prompt", "cwd", "timeout_s"}),
+    ]
+    for tool, params in expected:
+        missing = params - inspect.signature(tool).parameters.keys()
+        assert not missing, f"{tool.__name__} is missing parameters: {sorted(missing)}"
+        print(f"✓ {tool.__name__} has correct signature")
 
     print("\n✅ All tool signature tests passed")
 
 
-async def test_no_stdout_pollution():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_no_stdout_pollution(mcp_session):
     """Test that only MCP JSON-RPC is written to stdout."""
-    proc = await asyncio.create_subprocess_exec(
-        sys.executable,
-        "-m",
-        "agent_mesh.mcp_server",
-        stdin=asyncio.subprocess.PIPE,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        cwd=Path(__file__).parent.parent,
-    )
-
-    # Send initialize
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {"name": "test", "version": "1.0.0"},
-        },
-    }
-
-    proc.stdin.write((json.dumps(init_request) + "\n").encode())
-    await proc.stdin.drain()
-
-    # Read response
-    line = await asyncio.wait_for(proc.stdout.readline(), timeout=5.0)
+    # McpSession.rpc fails on any stdout line that isn't JSON
+    response = await mcp_session.rpc("tools/list")
 
     # Verify it's valid JSON-RPC
-    try:
-        response = json.loads(line)
-        assert "jsonrpc" in response, "Response missing jsonrpc field"
-        assert response["jsonrpc"] == "2.0", "Invalid jsonrpc version"
-        print("✓ stdout contains only valid JSON-RPC")
-    except json.JSONDecodeError as e:
-        raise AssertionError(f"stdout contains non-JSON data: {line}") from e
-
-    # Clean shutdown
-    proc.stdin.close()
-    await asyncio.wait_for(proc.wait(), timeout=2.0)
+    for message in (mcp_session.init_response, response):
+        assert "jsonrpc" in message, "Response missing jsonrpc field"
+        assert message["jsonrpc"] == "2.0", "Invalid jsonrpc version"
+    print("✓ stdout contains only valid JSON-RPC")
 
     print("\n✅ No stdout pollution test passed")
 
 
 if __name__ == "__main__":
-    print("Testing MCP Server (Phase 4)\n")
-    print("=" * 50)
-
-    asyncio.run(test_mcp_protocol())
-    print()
-    asyncio.run(test_tool_call())
-    print()
-    asyncio.run(test_no_stdout_pollution())
-
-    print("\n" + "=" * 50)
-    print("All Phase 4 acceptance criteria verified ✅")
+    # The protocol tests need the shared MCP server fixture, so go through pytest
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
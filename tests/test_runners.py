@@ -0,0 +1,262 @@
+"""Tests for agent_mesh.runners.base (no real LLM calls)."""
+
+import asyncio
+import errno
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from agent_mesh.runners import base, codex
+from agent_mesh.runners.base import resolve_cwd, run_subprocess, truncate_output
+from agent_mesh.types import AgentResult
+
+
+async def test_run_subprocess_captures_large_output():
+    """Output spanning many read chunks comes back intact."""
+    script = "import sys; sys.stdout.write('x' * 200_000); sys.stderr.write('err')"
+    exit_code, stdout, stderr, started_at, ended_at, duration_ms, dropped = await run_subprocess(
+        [sys.executable, "-c", script], ".", timeout_s=30
+    )
+
+    assert exit_code == 0
+    assert stdout == "x" * 200_000
+    assert stderr == "err"
+    assert ended_at >= started_at
+    assert duration_ms >= 0
+    assert dropped == 0
+
+
+async def test_run_subprocess_timeout_keeps_partial_output():
+    """On timeout, output written before the kill is still returned."""
+    script = "import sys, time; print('started', flush=True); time.sleep(30)"
+    exit_code, stdout, stderr, _, _, _, _ = await run_subprocess(
+        [sys.executable, "-c", script], ".", timeout_s=1
+    )
+
+    assert exit_code == -1
+    assert "started" in stdout
+    assert "TIMEOUT" in stderr
+
+
+async def test_run_subprocess_missing_command():
+    exit_code, stdout, stderr, _, _, _, _ = await run_subprocess(
+        ["agent-mesh-definitely-missing"], ".", timeout_s=5
+    )
+
+    assert exit_code == 127
+    assert "Command not found" in stderr
+
+
+async def test_run_subprocess_env_overrides(monkeypatch):
+    """Overrides reach the child on top of the inherited environment."""
+    monkeypatch.setenv("AGENT_MESH_INHERITED", "parent")
+    script = "import os; print(os.environ['AGENT_MESH_INHERITED'], os.environ['AGENT_MESH_OVERRIDE'])"
+    exit_code, stdout, _, _, _, _, _ = await run_subprocess(
+        [sys.executable, "-c", script],
+        ".",
+        timeout_s=30,
+        env={"AGENT_MESH_INHERITED": "parent", "AGENT_MESH_OVERRIDE": "child"},
+    )
+
+    assert exit_code == 0
+    assert stdout.split() == ["parent", "child"]
+
+
+def test_resolve_cwd(tmp_path, monkeypatch):
+    assert resolve_cwd(str(tmp_path)) == str(tmp_path)
+    assert resolve_cwd(f"{tmp_path}/sub/..") == str(tmp_path)
+
+    monkeypatch.chdir(tmp_path)
+    assert resolve_cwd(".") == os.path.abspath(tmp_path)
+    assert resolve_cwd("sub/..") == os.path.abspath(tmp_path)
+
+
+async def test_run_subprocess_cancellation_kills_child(tmp_path):
+    """Cancelling the awaiting task must not leave the child running."""
+    pid_file = tmp_path / "pid"
+    script = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+    task = asyncio.create_task(
+        run_subprocess([sys.executable, "-c", script], ".", timeout_s=60)
+    )
+    while not pid_file.exists() or not pid_file.read_text():
+        await asyncio.sleep(0.05)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+async def test_run_subprocess_caps_captured_output():
+    """Past the cap, the head is dropped and the tail is kept."""
+    script = "import sys; sys.stdout.write('a' * 500_000 + 'END')"
+    exit_code, stdout, _, _, _, _, dropped = await run_subprocess(
+        [sys.executable, "-c", script], ".", timeout_s=30, max_stdout_bytes=100_000
+    )
+
+    assert exit_code == 0
+    assert dropped == 500_003 - 100_000
+    assert stdout.startswith("[... ")
+    assert stdout.endswith("aEND")
+    assert len(stdout) < 500_000
+
+
+async def test_run_subprocess_timeout_drains_buffered_output():
+    """Output still sitting in the pipe when the child is killed is not lost."""
+    # More than one read chunk, written in one go right before hanging
+    script = "import sys, time; sys.stdout.write('y' * 300_000); sys.stdout.flush(); time.sleep(30)"
+    exit_code, stdout, _, _, _, _, _ = await run_subprocess(
+        [sys.executable, "-c", script], ".", timeout_s=1
+    )
+
+    assert exit_code == -1
+    assert stdout == "y" * 300_000
+
+
+async def test_run_subprocess_respects_max_parallel(monkeypatch):
+    """With one slot, concurrent calls run back to back, not overlapping."""
+    monkeypatch.setenv("AGENT_MESH_MAX_PARALLEL", "1")
+    cmd = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+    first, second = await asyncio.gather(
+        run_subprocess(cmd, ".", timeout_s=30),
+        run_subprocess(cmd, ".", timeout_s=30),
+    )
+
+    runs = sorted([first, second], key=lambda r: r[3])
+    assert runs[1][3] >= runs[0][4]
+
+
+async def test_run_subprocess_slot_wait_counts_toward_timeout(monkeypatch):
+    """A call queued behind a busy slot times out on its own timeout_s."""
+    monkeypatch.setenv("AGENT_MESH_MAX_PARALLEL", "1")
+    busy = asyncio.create_task(
+        run_subprocess([sys.executable, "-c", "import time; time.sleep(3)"], ".", timeout_s=30)
+    )
+    await asyncio.sleep(0.1)
+
+    exit_code, _, stderr, _, _, _, _ = await run_subprocess(
+        [sys.executable, "-c", "pass"], ".", timeout_s=1
+    )
+    await busy
+
+    assert exit_code == -1
+    assert "waiting for a free agent slot" in stderr
+
+
+def test_max_parallel_ignores_invalid_env(monkeypatch):
+    monkeypatch.setenv("AGENT_MESH_MAX_PARALLEL", "lots")
+    assert base._max_parallel() == max(8, os.cpu_count() or 1)
+
+    monkeypatch.setenv("AGENT_MESH_MAX_PARALLEL", "0")
+    assert base._max_parallel() == 1
+
+
+async def test_run_subprocess_reader_failure_returns_tuple(monkeypatch):
+    """A failing output reader is reported in the result, not raised."""
+
+    def full_disk(self, chunk):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(base._TailBuffer, "write", full_disk)
+    script = "import time; print('hi', flush=True); time.sleep(30)"
+    exit_code, stdout, stderr, _, _, _, _ = await asyncio.wait_for(
+        run_subprocess([sys.executable, "-c", script], ".", timeout_s=30), timeout=10
+    )
+
+    assert exit_code == 1
+    assert stdout == ""
+    assert "No space left on device" in stderr
+
+
+def test_truncate_output():
+    short = "x" * 2000
+    assert truncate_output(short) is short
+    assert truncate_output("abcdef", limit=3) == "abc\n... [truncated 3 chars]"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # An orphaned zombie lingers until init gets around to reaping it
+    try:
+        return "\nState:\tZ" not in Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return True
+
+
+async def test_run_subprocess_timeout_kills_grandchildren(tmp_path):
+    """Descendants the agent forked are killed along with it on timeout."""
+    pid_file = tmp_path / "pid"
+    script = (
+        "import subprocess, sys, time; "
+        "p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+        f"open({str(pid_file)!r}, 'w').write(str(p.pid)); time.sleep(60)"
+    )
+    # A surviving grandchild holds the pipes open, which would stall the call
+    exit_code, _, _, _, _, _, _ = await asyncio.wait_for(
+        run_subprocess([sys.executable, "-c", script], ".", timeout_s=1), timeout=15
+    )
+
+    assert exit_code == -1
+    grandchild = int(pid_file.read_text())
+    for _ in range(50):
+        if not _pid_alive(grandchild):
+            break
+        await asyncio.sleep(0.05)
+    assert not _pid_alive(grandchild)
+
+
+def _fake_subprocess(stdout: str, exit_code: int = 0, dropped: int = 0):
+    async def fake_run_subprocess(cmd, cwd, timeout_s, env=None, max_stdout_bytes=None):
+        now = datetime.now(timezone.utc)
+        return exit_code, stdout, "", now, now, 0, dropped
+
+    return fake_run_subprocess
+
+
+async def test_run_codex_parses_jsonl_events(monkeypatch):
+    events = [
+        {"type": "thread.started"},
+        {"type": "item.completed", "item": {"type": "agent_message", "text": "first"}},
+        {"type": "item.completed", "item": {"type": "reasoning", "text": "hmm"}},
+        {"type": "item.completed", "item": {"type": "agent_message", "text": "final"}},
+        {"type": "turn.completed"},
+    ]
+    stdout = "\n".join(json.dumps(e) for e in events) + "\nnot json\n"
+    monkeypatch.setattr(codex, "run_subprocess", _fake_subprocess(stdout))
+
+    result = await codex.run_codex("task", "/tmp")
+
+    assert result.ok
+    assert result.structured == {"response": "final", "event_count": 5}
+    # Built without validation, but must still be a valid AgentResult
+    assert AgentResult.model_validate(result.model_dump()) == result
+
+
+async def test_run_codex_omits_event_count_when_capped(monkeypatch):
+    """A capped capture only has the tail, so no event count is reported."""
+    event = {"type": "item.completed", "item": {"type": "agent_message", "text": "final"}}
+    stdout = "[... 1000 bytes dropped from start of output ...]\n" + json.dumps(event) + "\n"
+    monkeypatch.setattr(codex, "run_subprocess", _fake_subprocess(stdout, dropped=1000))
+
+    result = await codex.run_codex("task", "/tmp")
+
+    assert result.structured == {"response": "final"}
+
+
+async def test_run_codex_counts_events_when_output_looks_capped(monkeypatch):
+    """Only the reported drop count decides, not what the text starts with."""
+    stdout = "[... not a marker\n" + json.dumps({"type": "turn.completed"}) + "\n"
+    monkeypatch.setattr(codex, "run_subprocess", _fake_subprocess(stdout))
+
+    result = await codex.run_codex("task", "/tmp")
+
+    assert result.structured == {"event_count": 1}